@@ -1,6 +1,8 @@
 # Copyright (C) 2011-2018  Patrick Totzke <patricktotzke@gmail.com>
 # This file is released under the GNU GPL, version 3 or a later revision.
 # For further details see the COPYING file
+import itertools
+
 import urwid
 
 from .buffer import Buffer
@@ -33,25 +35,49 @@ class BufferlistBuffer(Buffer):
         else:
             focusposition = 0
             self.isinitialized = True
+            # buffer -> (line, index text, attribute map) of its displayed line
+            self._row_by_buf = {}
+            self.bufferlist = urwid.ListBox(urwid.SimpleListWalker([]))
 
         lines = list()
+        rows = dict()
+        # position of each buffer in the global list, computed once instead
+        # of looking it up for every displayed buffer
+        index = {id(b): i for i, b in enumerate(self.ui.buffers)}
         displayedbuffers = [b for b in self.ui.buffers if self.filtfun(b)]
-        for (num, b) in enumerate(displayedbuffers):
-            line = BufferlineWidget(b)
-            if (num % 2) == 0:
-                attr = settings.get_theming_attribute('bufferlist',
-                                                      'line_even')
+        # lines of buffers that are no longer displayed get recycled for
+        # newly displayed ones
+        shown = set(displayedbuffers)
+        spare = [row for b, row in self._row_by_buf.items() if b not in shown]
+        even_att = settings.get_theming_attribute('bufferlist', 'line_even')
+        odd_att = settings.get_theming_attribute('bufferlist', 'line_odd')
+        focus_att = settings.get_theming_attribute('bufferlist', 'line_focus')
+        attrs = itertools.cycle((even_att, odd_att))
+        for b in displayedbuffers:
+            attr = next(attrs)
+            row = self._row_by_buf.get(b)
+            if row is None and spare:
+                row = spare.pop()
+            if row is None:
+                buf = urwid.AttrMap(BufferlineWidget(b), attr, focus_att)
+                num = urwid.Text('%3d:' % index[id(b)])
+                row = (urwid.Columns([('fixed', 4, num), buf]), num, buf)
             else:
-                attr = settings.get_theming_attribute('bufferlist', 'line_odd')
-            focus_att = settings.get_theming_attribute('bufferlist',
-                                                       'line_focus')
-            buf = urwid.AttrMap(line, attr, focus_att)
-            num = urwid.Text('%3d:' % self.index_of(b))
-            lines.append(urwid.Columns([('fixed', 4, num), buf]))
-        self.bufferlist = urwid.ListBox(urwid.SimpleListWalker(lines))
-        num_buffers = len(displayedbuffers)
-        if focusposition is not None and num_buffers > 0:
-            self.bufferlist.set_focus(focusposition % num_buffers)
+                # only patch the existing line instead of building a new one
+                _, num, buf = row
+                buf.original_widget.set_buffer(b)
+                buf.set_attr_map({None: attr})
+                buf.set_focus_map({None: focus_att})
+                num.set_text('%3d:' % index[id(b)])
+            rows[b] = row
+            lines.append(row[0])
+        self._row_by_buf = rows
+        # replace the walker's content in place to keep the list box around
+        self.bufferlist.body[:] = lines
+        if focusposition is not None and displayedbuffers:
+            # stay on the last line if buffers after the focus were closed
+            self.bufferlist.set_focus(
+                min(focusposition, len(displayedbuffers) - 1))
         self.body = self.bufferlist
 
     def get_selected_buffer(self):
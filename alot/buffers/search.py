@@ -41,7 +41,17 @@ class SearchBuffer(Buffer):
         info['result_count_positive'] = 's' if self.result_count > 1 else ''
         return info
 
-    def rebuild(self, reverse=False):
+    def rebuild(self, reverse=False, recount=True):
+        """
+        (re)reads the threads matching the query from the database.
+
+        :param reverse: list the threads in reverse sort order
+        :type reverse: bool
+        :param recount: count the matching messages again. Counting makes
+            notmuch evaluate the whole query, so rebuilds that only flip the
+            sort order keep the current count.
+        :type recount: bool
+        """
         self.isinitialized = True
         self.reversed = reverse
 
@@ -55,7 +65,9 @@ class SearchBuffer(Buffer):
             exclude_tags = [t for t in exclude_tags.split(';') if t]
 
         try:
-            self.result_count = self.dbman.count_messages(self.querystring)
+            if recount:
+                self.result_count = self.dbman.count_messages(
+                    self.querystring)
             threads = self.dbman.get_threads(
                 self.querystring, order, exclude_tags)
         except NotmuchError:
@@ -96,15 +108,16 @@ class SearchBuffer(Buffer):
         if not self.reversed:
             self.body.set_focus(0)
         else:
-            self.rebuild(reverse=False)
+            self.rebuild(reverse=False, recount=False)
 
     def focus_last(self):
         if self.reversed:
             self.body.set_focus(0)
         elif self.result_count < 200 or self.sort_order not in self._REVERSE:
             self.consume_pipe()
-            num_lines = len(self.threadlist.get_lines())
-            self.body.set_focus(num_lines - 1)
+            num_lines = len(self.threadlist.get_items())
+            if num_lines:
+                self.body.set_focus(num_lines - 1)
         else:
-            self.rebuild(reverse=True)
+            self.rebuild(reverse=True, recount=False)
 
@@ -308,8 +308,8 @@ class ThreadBuffer(Buffer):
 
     def expand_all(self):
         """expand all messages in thread"""
-        for MT in self.messagetrees():
-            MT.expand(MT.root)
+        for pos in self._tree.positions():
+            self._tree.set_collapsed(pos, False)
 
     def collapse(self, msgpos):
         """collapse message at given position"""
@@ -319,8 +319,8 @@ class ThreadBuffer(Buffer):
 
     def collapse_all(self):
         """collapse all messages in thread"""
-        for MT in self.messagetrees():
-            MT.collapse(MT.root)
+        for pos in self._tree.positions():
+            self._tree.set_collapsed(pos, True)
         self.focus_selected_message()
 
     def unfold_matching(self, querystring, focus_first=True):
@@ -333,13 +333,10 @@ class ThreadBuffer(Buffer):
         :type focus_first: bool
         """
         first = None
-        for MT in self.messagetrees():
-            msg = MT._message
-            if msg.matches(querystring):
-                MT.expand(MT.root)
-                if first is None:
-                    first = (self._tree.position_of_messagetree(MT), MT.root)
-                    self.body.set_focus(first)
-            else:
-                MT.collapse(MT.root)
+        for pos in self._tree.positions():
+            matches = self._tree.get_message(pos).matches(querystring)
+            self._tree.set_collapsed(pos, not matches)
+            if matches and first is None:
+                first = (pos, self._tree[pos].root)
+                self.body.set_focus(first)
         self.body.refresh()
@@ -192,9 +192,10 @@ class TagCommand(Command):
             if not self.allm:
                 if hitcount_after == 0:
                     logging.debug('remove thread from result list: %s', thread)
-                    if threadline_widget in searchbuffer.threadlist:
+                    tid = thread.get_thread_id()
+                    if tid in searchbuffer.threadlist:
                         # remove this thread from result list
-                        searchbuffer.threadlist.remove(threadline_widget)
+                        searchbuffer.threadlist.remove(tid)
                 else:
                     threadline_widget.rebuild()
                 searchbuffer.result_count = searchbuffer.dbman.count_messages(
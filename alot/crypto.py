@@ -2,11 +2,88 @@
 # Copyright © 2017-2018 Dylan Baker <dylan@pnwbakers.com>
 # This file is released under the GNU GPL, version 3 or a later revision.
 # For further details see the COPYING file
+import collections
+import functools
+import logging
+import threading
+import time
+
 import gpg
 
 from .errors import GPGProblem, GPGCode
 
 
+# gpg contexts are expensive to set up, so we keep one plain and one armored
+# context per thread around and reuse them for all operations
+_tls = threading.local()
+
+
+def _get_ctx(armor=False):
+    """
+    Returns the cached gpg context of the calling thread, creating it on first
+    use.
+
+    :param armor: whether to return the context producing ASCII armored output
+    :type armor: bool
+    :returns: a gpg context without any signers set
+    :rtype: gpg.core.Context
+    """
+    attr = 'ctx_armor' if armor else 'ctx'
+    ctx = getattr(_tls, attr, None)
+    if ctx is None:
+        ctx = gpg.core.Context(armor=armor)
+        setattr(_tls, attr, ctx)
+    ctx.signers = []
+    return ctx
+
+
+# results of keyring lookups, kept for a short while as they are requested
+# repeatedly for the same recipients while composing and verifying mails
+_KEY_CACHE = collections.OrderedDict()
+_KEYLIST_CACHE = collections.OrderedDict()
+_KEY_CACHE_MAX = 128
+_KEY_CACHE_TTL = 60
+# the caches are also filled from a background thread by prime_key_cache
+_KEY_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(cache, key):
+    """
+    Looks up `key` in one of the bounded lookup caches of this module.
+
+    :returns: a tuple of a bool telling whether a fresh entry was found and
+        the cached value
+    :rtype: tuple[bool, object]
+    """
+    with _KEY_CACHE_LOCK:
+        entry = cache.get(key)
+        if entry is not None:
+            expires, value = entry
+            if time.monotonic() < expires:
+                cache.move_to_end(key)
+                return True, value
+            del cache[key]
+    return False, None
+
+
+def _cache_put(cache, key, value):
+    """
+    Stores `value` under `key` in one of the bounded lookup caches of this
+    module, evicting the least recently used entry if the cache is full.
+    """
+    with _KEY_CACHE_LOCK:
+        cache[key] = (time.monotonic() + _KEY_CACHE_TTL, value)
+        cache.move_to_end(key)
+        if len(cache) > _KEY_CACHE_MAX:
+            cache.popitem(last=False)
+
+
+def _cache_clear(cache):
+    """Drops all entries of one of the lookup caches of this module."""
+    with _KEY_CACHE_LOCK:
+        cache.clear()
+
+
 def RFC3156_micalg_from_algo(hash_algo):
     """
     Converts a GPGME hash algorithm name to one conforming to RFC3156.
@@ -41,6 +118,9 @@ def get_key(keyid, validate=False, encrypt=False, sign=False,
     keyid is part of the user id associated with the key, not if it is part of
     the key fingerprint.
 
+    Successful lookups are cached for a minute, use :func:`get_key.cache_clear`
+    to drop them when the keyring changes.
+
     :param keyid: filter term for the keyring (usually a key ID)
     :type keyid: str
     :param validate: validate that returned keyid is valid
@@ -60,7 +140,22 @@ def get_key(keyid, validate=False, encrypt=False, sign=False,
     :raises ~alot.errors.GPGProblem: if a key is found, but signed_only is true
         and the key is unused
     """
-    ctx = gpg.core.Context()
+    cache_key = (keyid, validate, encrypt, sign, signed_only)
+    found, key = _cache_get(_KEY_CACHE, cache_key)
+    if not found:
+        key = _get_key(keyid, validate=validate, encrypt=encrypt, sign=sign,
+                       signed_only=signed_only)
+        _cache_put(_KEY_CACHE, cache_key, key)
+    return key
+
+
+get_key.cache_clear = functools.partial(_cache_clear, _KEY_CACHE)
+
+
+def _get_key(keyid, validate=False, encrypt=False, sign=False,
+             signed_only=False):
+    """uncached implementation of :func:`get_key`"""
+    ctx = _get_ctx()
     try:
         key = ctx.get_key(keyid)
         if validate:
@@ -118,21 +213,57 @@ def get_key(keyid, validate=False, encrypt=False, sign=False,
 
 def list_keys(hint=None, private=False):
     """
-    Returns a generator of all keys containing the fingerprint, or all keys if
-    hint is None.
+    Returns a list of all keys containing the fingerprint, or all keys if
+    hint is None. Like :func:`get_key` the result is cached for a minute.
 
-    The generator may raise exceptions of :class:gpg.errors.GPGMEError, and it
-    is the caller's responsibility to handle them.
+    Exceptions of :class:gpg.errors.GPGMEError are not handled, it is the
+    caller's responsibility to handle them.
 
     :param hint: Part of a fingerprint to usee to search
     :type hint: str or None
     :param private: Whether to return public keys or secret keys
     :type private: bool
-    :returns: A generator that yields keys.
-    :rtype: Generator[gpg.gpgme.gpgme_key_t, None, None]
+    :returns: A list of keys.
+    :rtype: list[gpg.gpgme.gpgme_key_t]
+    """
+    cache_key = (hint, private)
+    found, keys = _cache_get(_KEYLIST_CACHE, cache_key)
+    if not found:
+        keys = tuple(_get_ctx().keylist(hint, private))
+        _cache_put(_KEYLIST_CACHE, cache_key, keys)
+    return list(keys)
+
+
+list_keys.cache_clear = functools.partial(_cache_clear, _KEYLIST_CACHE)
+
+
+def prime_key_cache(fingerprints):
+    """
+    Fills the cache of :func:`get_key` with the keys of the given fingerprints
+    so that the first lookups do not have to wait for gpg.
+
+    Each key is also stored under the fingerprints of its subkeys, as
+    signature verification looks keys up by the fingerprint of the signing
+    subkey. Only plain lookups without validation are primed, and no more
+    fingerprints than the cache can hold. This is meant to be run in a
+    background thread, errors are logged and otherwise ignored.
+
+    :param fingerprints: fingerprints of the keys to look up
+    :type fingerprints: list[str]
     """
-    ctx = gpg.core.Context()
-    return ctx.keylist(hint, private)
+    primed = 0
+    for fpr in fingerprints:
+        try:
+            key = get_key(fpr)
+        except (GPGProblem, gpg.errors.GPGMEError) as e:
+            logging.debug('cannot prime the key cache for %s: %s', fpr, e)
+            continue
+        for subkey in key.subkeys:
+            if primed >= _KEY_CACHE_MAX:
+                return
+            _cache_put(_KEY_CACHE, (subkey.fpr, False, False, False, False),
+                       key)
+            primed += 1
 
 
 def detached_signature_for(plaintext_str, keys):
@@ -148,10 +279,13 @@ def detached_signature_for(plaintext_str, keys):
     :returns: A list of signature and the signed blob of data
     :rtype: tuple[list[gpg.results.NewSignature], str]
     """
-    ctx = gpg.core.Context(armor=True)
+    ctx = _get_ctx(armor=True)
     ctx.signers = keys
-    (sigblob, sign_result) = ctx.sign(plaintext_str,
-                                      mode=gpg.constants.SIG_MODE_DETACH)
+    try:
+        (sigblob, sign_result) = ctx.sign(plaintext_str,
+                                          mode=gpg.constants.SIG_MODE_DETACH)
+    finally:
+        ctx.signers = []
     return sign_result.signatures, sigblob
 
 
@@ -165,7 +299,7 @@ def encrypt(plaintext_str, keys):
     :rtype: str
     """
     assert keys, 'Must provide at least one key to encrypt with'
-    ctx = gpg.core.Context(armor=True)
+    ctx = _get_ctx(armor=True)
     out = ctx.encrypt(plaintext_str, recipients=keys, sign=False,
                       always_trust=True)[0]
     return out
@@ -196,7 +330,7 @@ def verify_detached(message, signature):
     :rtype: list[gpg.results.Signature]
     :raises alot.errors.GPGProblem: if the verification fails
     """
-    ctx = gpg.core.Context()
+    ctx = _get_ctx()
     try:
         verify_results = ctx.verify(message, signature)[1]
         return verify_results.signatures
@@ -222,7 +356,7 @@ def decrypt_verify(encrypted, session_keys=None):
         except GPGProblem:
             pass
 
-    ctx = gpg.core.Context()
+    ctx = _get_ctx()
     return _decrypt_verify_with_context(ctx, encrypted)
 
 
@@ -237,6 +371,8 @@ def _decrypt_verify_session_keys(encrypted, session_keys):
     :raises alot.errors.GPGProblem: if the decryption fails
     """
     for key in session_keys:
+        # setting the session key flag would leak into later operations, so
+        # this needs a fresh context instead of the cached one
         ctx = gpg.core.Context()
         ctx.set_ctx_flag("override-session-key", key)
         try:
@@ -315,10 +451,9 @@ def check_uid_validity(key, email):
     :returns: whether the key can be assumed to belong to the given email
     :rtype: bool
     """
-    def check(key_uid):
-        return (email == key_uid.email and
-                not key_uid.revoked and
-                not key_uid.invalid and
-                key_uid.validity >= gpg.constants.validity.FULL)
-
-    return any(check(u) for u in key.uids)
+    full = gpg.constants.validity.FULL
+    return any(email == u.email and
+               not u.revoked and
+               not u.invalid and
+               u.validity >= full
+               for u in key.uids)
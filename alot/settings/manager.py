@@ -39,6 +39,8 @@ class SettingsManager:
         self._notmuchconfig = None
         self._config = ConfigObj()
         self._bindings = None
+        # mode -> (globalmaps, modemaps) as returned by get_keybindings
+        self._keybindings = {}
 
     def reload(self):
         """Reload notmuch and alot config files"""
@@ -60,6 +62,7 @@ class SettingsManager:
         self._bindings = ConfigObj(os.path.join(DEFAULTSPATH,
                                                 'default.bindings'))
         self._bindings.merge(newbindings)
+        self._keybindings = {}
 
     def read_config(self, path):
         """
@@ -402,6 +405,10 @@ class SettingsManager:
         :returns: dictionaries of key-cmd for global and specific mode
         :rtype: 2-tuple of dicts
         """
+        # this is looked up on every keypress, so only compute it once per
+        # mode and set of bindings
+        if mode in self._keybindings:
+            return self._keybindings[mode]
         globalmaps, modemaps = {}, {}
         bindings = self._bindings
         # get bindings for mode `mode`
@@ -426,6 +433,7 @@ class SettingsManager:
             if not v:
                 del modemaps[k]
 
+        self._keybindings[mode] = globalmaps, modemaps
         return globalmaps, modemaps
 
     def get_keybinding(self, mode, key):
@@ -438,22 +446,10 @@ class SettingsManager:
         :returns: a command line to be applied upon keypress
         :rtype: str
         """
-        cmdline = None
-        bindings = self._bindings
-        if key in bindings.scalars:
-            cmdline = bindings[key]
-        if mode in bindings.sections:
-            if key in bindings[mode].scalars:
-                value = bindings[mode][key]
-                if value:
-                    cmdline = value
-                else:
-                    # to be sure it isn't mapped globally
-                    cmdline = None
-        # Workaround for ConfigObj misbehaviour. cf issue #500
-        # this ensures that we get at least strings only as commandlines
-        if isinstance(cmdline, list):
-            cmdline = ','.join(cmdline)
+        globalmaps, modemaps = self.get_keybindings(mode)
+        cmdline = modemaps.get(key)
+        if cmdline is None:
+            cmdline = globalmaps.get(key)
         return cmdline
 
     def get_accounts(self):
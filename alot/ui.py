@@ -11,6 +11,7 @@ import traceback
 
 import urwid
 
+from . import crypto
 from .settings.const import settings
 from .buffers import BufferlistBuffer
 from .buffers import SearchBuffer
@@ -134,6 +135,13 @@ class UI:
         logging.info('setup gui in %d colours', colourmode)
         self.mainloop.screen.set_terminal_properties(colors=colourmode)
 
+        # look up the accounts' own keys in the background, they are needed
+        # to show the signatures of the user's mails and to sign new ones
+        fingerprints = [a.gpg_key.fpr for a in settings.get_accounts()
+                        if a.gpg_key is not None]
+        if fingerprints:
+            loop.run_in_executor(None, crypto.prime_key_cache, fingerprints)
+
         logging.debug('fire first command')
         loop.create_task(self.apply_commandline(initialcmdline))
 
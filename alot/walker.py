@@ -2,9 +2,12 @@
 # Copyright © 2018 Dylan Baker
 # This file is released under the GNU GPL, version 3 or a later revision.
 # For further details see the COPYING file
+import collections
 import logging
 import urwid
 
+from .db.errors import NonexistantObjectError
+
 
 class IterableWalker(urwid.ListWalker):
 
@@ -14,66 +17,104 @@ class IterableWalker(urwid.ListWalker):
     concrete type. This allows for lazy operations of very large sequences of
     data, such as a sequences of threads with certain notmuch tags.
 
+    Only the objects read from the iterable are remembered. The container
+    widgets are built on demand and the most recently used ones are kept in a
+    LRU cache, so walking over huge sequences keeps only the recently
+    displayed lines around.
+
     :param iterable: An iterator of objects to walk over
     :type iterable: Iterable[T]
     :param containerclass: An urwid widget to wrap each object in
     :type containerclass: urwid.Widget
     :param reverse: Reverse the order of the iterable
     :type reverse: bool
+    :param cache: maximal number of container widgets to keep around
+    :type cache: int
     :param **kwargs: Forwarded to container class.
     """
 
-    def __init__(self, iterable, containerclass, reverse=False, **kwargs):
+    def __init__(self, iterable, containerclass, reverse=False, cache=1024,
+                 **kwargs):
         self.iterable = iterable
         self.kwargs = kwargs
         self.containerclass = containerclass
-        self.lines = []
+        self.items = []
+        self.widgets = collections.OrderedDict()
+        self.cache = cache
         self.focus = 0
         self.empty = False
         self.direction = -1 if reverse else 1
 
-    def __contains__(self, name):
-        return self.lines.__contains__(name)
+    def __contains__(self, obj):
+        return self.items.__contains__(obj)
 
     def get_focus(self):
-        return self._get_at_pos(self.focus)
+        widget, pos = self._get_at_pos(self.focus, 1)
+        if widget is None and 0 < len(self.items) <= self.focus:
+            # the focussed object went away and was the last one
+            self.focus = len(self.items) - 1
+            widget, pos = self._get_at_pos(self.focus, -1)
+        return widget, pos
 
     def set_focus(self, focus):
         self.focus = focus
         self._modified()
 
     def get_next(self, start_from):
-        return self._get_at_pos(start_from + self.direction)
+        return self._get_at_pos(start_from + self.direction, self.direction)
 
     def get_prev(self, start_from):
-        return self._get_at_pos(start_from - self.direction)
+        return self._get_at_pos(start_from - self.direction, -self.direction)
 
     def remove(self, obj):
-        next_focus = self.focus % len(self.lines)
-        if self.focus == len(self.lines) - 1 and self.empty:
+        next_focus = self.focus % len(self.items)
+        if self.focus == len(self.items) - 1 and self.empty:
             next_focus = self.focus - 1
 
-        self.lines.remove(obj)
-        if self.lines:
+        self._drop(self.items.index(obj))
+        if self.items:
             self.set_focus(next_focus)
         self._modified()
 
-    def _get_at_pos(self, pos):
-        if pos < 0:  # pos too low
-            return (None, None)
-        elif pos > len(self.lines):  # pos too high
-            return (None, None)
-        elif len(self.lines) > pos:  # pos already cached
-            return (self.lines[pos], pos)
-        else:  # pos not cached yet, look at next item from iterator
-            if self.empty:  # iterator is empty
+    def _drop(self, pos):
+        del self.items[pos]
+        # all cached widgets after the removed one move up by one position
+        self.widgets = collections.OrderedDict(
+            (p - 1 if p > pos else p, w)
+            for p, w in self.widgets.items() if p != pos)
+
+    def _get_at_pos(self, pos, step):
+        while True:
+            if pos < 0:  # pos too low
+                return (None, None)
+            elif pos > len(self.items):  # pos too high
                 return (None, None)
-            else:
-                widget = self._get_next_item()
-                if widget:
-                    return (widget, pos)
-                else:
+            elif pos == len(self.items):  # pos not read yet
+                if self._get_next_item() is None:
                     return (None, None)
+            try:
+                return (self._get_widget(pos), pos)
+            except NonexistantObjectError:
+                # the object went away since it was read (e.g. the thread
+                # of an evicted line got deleted), skip over it
+                logging.debug('dropping vanished object at %d', pos)
+                self._drop(pos)
+                if self.focus > pos:
+                    self.focus -= 1
+                if step < 0:
+                    pos -= 1
+                self._modified()
+
+    def _get_widget(self, pos):
+        widget = self.widgets.get(pos)
+        if widget is not None:
+            self.widgets.move_to_end(pos)
+            return widget
+        widget = self.containerclass(self.items[pos], **self.kwargs)
+        self.widgets[pos] = widget
+        if len(self.widgets) > self.cache:
+            self.widgets.popitem(last=False)
+        return widget
 
     def _get_next_item(self):
         if self.empty:
@@ -82,13 +123,12 @@ class IterableWalker(urwid.ListWalker):
             # the next line blocks until it can read from the pipe or
             # EOFError is raised. No races here.
             next_obj = next(self.iterable)
-            next_widget = self.containerclass(next_obj, **self.kwargs)
-            self.lines.append(next_widget)
+            self.items.append(next_obj)
         except StopIteration:
             logging.debug('EMPTY PIPE')
-            next_widget = None
+            next_obj = None
             self.empty = True
-        return next_widget
+        return next_obj
 
-    def get_lines(self):
-        return self.lines
+    def get_items(self):
+        return self.items
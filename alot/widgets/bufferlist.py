@@ -19,6 +19,11 @@ class BufferlineWidget(urwid.Text):
         line = buffer.__str__()
         urwid.Text.__init__(self, line, wrap='clip')
 
+    def set_buffer(self, buffer):
+        """display `buffer` (again), refreshing the line's text"""
+        self.buffer = buffer
+        self.set_text(buffer.__str__())
+
     def selectable(self):
         return True
 
@@ -332,12 +332,17 @@ class ThreadTree(Tree):
         self._last_child_of = {}
         self._next_sibling_of = {}
         self._prev_sibling_of = {}
+        # MessageTrees are only built once they are requested, until then we
+        # remember the arguments needed to construct them and whether they
+        # should start out collapsed
         self._message = {}
+        self._message_args = {}
+        self._collapsed = {}
 
         def accumulate(msg, odd=True):
             """recursively read msg and its replies"""
             mid = msg.get_message_id()
-            self._message[mid] = MessageTree(msg, odd)
+            self._message_args[mid] = (msg, odd)
             odd = not odd
             last = None
             self._first_child_of[mid] = None
@@ -364,7 +369,13 @@ class ThreadTree(Tree):
 
     # Tree API
     def __getitem__(self, pos):
-        return self._message.get(pos)
+        mt = self._message.get(pos)
+        if mt is None and pos in self._message_args:
+            mt = MessageTree(*self._message_args.pop(pos))
+            self._message[pos] = mt
+            if pos in self._collapsed:
+                self.set_collapsed(pos, self._collapsed.pop(pos))
+        return mt
 
     def parent_position(self, pos):
         return self._parent_of.get(pos)
@@ -381,6 +392,29 @@ class ThreadTree(Tree):
     def prev_sibling_position(self, pos):
         return self._prev_sibling_of.get(pos)
 
+    def get_message(self, pos):
+        """
+        returns the :class:`~alot.db.message.Message` at given position
+        without building its :class:`MessageTree`
+        """
+        mt = self._message.get(pos)
+        if mt is not None:
+            return mt.get_message()
+        return self._message_args[pos][0]
+
+    def set_collapsed(self, pos, collapsed):
+        """
+        collapse or expand the message at given position. If its
+        :class:`MessageTree` was not built yet, this is deferred until it is.
+        """
+        mt = self._message.get(pos)
+        if mt is None:
+            self._collapsed[pos] = collapsed
+        elif collapsed:
+            mt.collapse(mt.root)
+        else:
+            mt.expand(mt.root)
+
     @staticmethod
     def position_of_messagetree(mt):
         return mt._message.get_message_id()
@@ -0,0 +1,61 @@
+# This file is released under the GNU GPL, version 3 or a later revision.
+# For further details see the COPYING file
+
+"""Tests for the alot.buffers.thread module."""
+
+import unittest
+from unittest import mock
+
+from alot.buffers import thread
+
+
+def _make_thread(count):
+    """a mock thread with `count` top level messages, the last one matching
+    the query 'match'"""
+    messages = []
+    for i in range(count):
+        msg = mock.Mock()
+        msg.get_message_id.return_value = 'mid{}'.format(i)
+        msg.matches.side_effect = lambda q, i=i: i == count - 1
+        messages.append(msg)
+    t = mock.Mock()
+    t.get_toplevel_messages.return_value = messages
+    t.get_replies_to.return_value = []
+    t.get_total_messages.return_value = count
+    return t
+
+
+class TestThreadBuffer(unittest.TestCase):
+
+    def setUp(self):
+        for target in ['alot.buffers.thread.NestedTree',
+                       'alot.buffers.thread.TreeBox']:
+            patcher = mock.patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('alot.widgets.thread.MessageTree',
+                             side_effect=lambda msg, odd: mock.Mock(root=0))
+        self.messagetree = patcher.start()
+        self.addCleanup(patcher.stop)
+        with mock.patch('alot.buffers.thread.settings.get',
+                        mock.Mock(return_value=0)):
+            self.buffer = thread.ThreadBuffer(mock.Mock(), _make_thread(10))
+
+    def test_unfold_matching_builds_only_matches(self):
+        self.buffer.unfold_matching('match')
+        self.assertEqual(self.messagetree.call_count, 1)
+        self.buffer.body.set_focus.assert_called_once_with(('mid9', 0))
+        mt = self.buffer._tree['mid9']
+        mt.expand.assert_called_once_with(0)
+
+    def test_collapsed_state_is_applied_when_built(self):
+        self.buffer.unfold_matching('match')
+        mt = self.buffer._tree['mid0']
+        mt.collapse.assert_called_once_with(0)
+        mt.expand.assert_not_called()
+        self.assertEqual(self.messagetree.call_count, 2)
+
+    def test_expand_all_defers(self):
+        self.buffer.expand_all()
+        self.assertEqual(self.messagetree.call_count, 0)
+        self.buffer._tree['mid3'].expand.assert_called_once_with(0)
@@ -52,6 +52,8 @@ def setUpModule():
     mock_home = mock.patch.dict(os.environ, {'GNUPGHOME': home})
     mock_home.start()
     MOD_CLEAN.add_cleanup(mock_home.stop)
+    crypto.get_key.cache_clear()
+    crypto.list_keys.cache_clear()
 
     with gpg.core.Context(armor=True) as ctx:
         # Add the public and private keys. They have no password
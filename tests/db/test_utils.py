@@ -366,6 +366,8 @@ class TestMessageFromFile(TestCaseClassCleanup):
         mock_home = mock.patch.dict(os.environ, {'GNUPGHOME': home})
         mock_home.start()
         cls.addClassCleanup(mock_home.stop)
+        crypto.get_key.cache_clear()
+        crypto.list_keys.cache_clear()
 
         with gpg.core.Context() as ctx:
             search_dir = os.path.join(os.path.dirname(__file__),
@@ -197,6 +197,56 @@ class TestSettingsManager(unittest.TestCase):
         manager.read_config(f.name)
         self.assertEqual(manager.get_tagstring_representation(tag)['translated'], translated_goal)
 
+
+class TestSettingsManagerKeybindings(unittest.TestCase):
+
+    def _manager(self, bindings):
+        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as f:
+            f.write(bindings)
+        self.addCleanup(os.unlink, f.name)
+        manager = SettingsManager()
+        manager.read_config(f.name)
+        return manager
+
+    def test_mode_binding_overrides_global(self):
+        manager = self._manager(textwrap.dedent("""\
+            [bindings]
+                x = bclose
+                [[search]]
+                    x = search foo
+            """))
+        self.assertEqual(manager.get_keybinding('search', 'x'), 'search foo')
+        self.assertEqual(manager.get_keybinding('thread', 'x'), 'bclose')
+
+    def test_empty_mode_binding_silences_global(self):
+        manager = self._manager(textwrap.dedent("""\
+            [bindings]
+                [[search]]
+                    j =
+            """))
+        self.assertIsNone(manager.get_keybinding('search', 'j'))
+        self.assertEqual(manager.get_keybinding('thread', 'j'), 'move down')
+
+    def test_unbound_key(self):
+        manager = self._manager('')
+        self.assertIsNone(manager.get_keybinding('search', 'F12'))
+
+    def test_cache_dropped_on_new_bindings(self):
+        manager = self._manager(textwrap.dedent("""\
+            [bindings]
+                x = bclose
+            """))
+        self.assertEqual(manager.get_keybinding('search', 'x'), 'bclose')
+        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as f:
+            f.write(textwrap.dedent("""\
+                [bindings]
+                    x = exit
+                """))
+        self.addCleanup(os.unlink, f.name)
+        manager.read_config(f.name)
+        self.assertEqual(manager.get_keybinding('search', 'x'), 'exit')
+
+
 class TestSettingsManagerExpandEnvironment(unittest.TestCase):
     """ Tests SettingsManager._expand_config_values """
     setting_name = 'template_dir'
@@ -42,6 +42,8 @@ def setUpModule():
     mock_home = mock.patch.dict(os.environ, {'GNUPGHOME': home})
     mock_home.start()
     MOD_CLEAN.add_cleanup(mock_home.stop)
+    crypto.get_key.cache_clear()
+    crypto.list_keys.cache_clear()
 
     with gpg.core.Context(armor=True) as ctx:
         # Add the public and private keys. They have no password
@@ -108,6 +110,23 @@ class TestHashAlgorithmHelper(unittest.TestCase):
             crypto.RFC3156_micalg_from_algo(gpg.constants.md.NONE)
 
 
+class TestGetCtx(unittest.TestCase):
+
+    def test_context_is_reused(self):
+        self.assertIs(crypto._get_ctx(), crypto._get_ctx())
+
+    def test_armor_context_is_separate(self):
+        ctx = crypto._get_ctx(armor=True)
+        self.assertIsNot(ctx, crypto._get_ctx())
+        self.assertTrue(ctx.armor)
+
+    def test_signers_are_reset(self):
+        ctx = crypto._get_ctx(armor=True)
+        with gpg.core.Context() as other:
+            ctx.signers = [other.get_key(FPR)]
+        self.assertEqual(crypto._get_ctx(armor=True).signers, [])
+
+
 class TestDetachedSignatureFor(unittest.TestCase):
 
     def test_valid_signature_generated(self):
@@ -130,6 +149,28 @@ class TestDetachedSignatureFor(unittest.TestCase):
                                     stdout=DEVNULL, stderr=DEVNULL)
         self.assertEqual(res, 0)
 
+    def test_signers_are_reset(self):
+        with gpg.core.Context() as ctx:
+            crypto.detached_signature_for(b"text", [ctx.get_key(FPR)])
+        self.assertEqual(crypto._get_ctx(armor=True).signers, [])
+
+    def test_signers_are_reset_on_error(self):
+        ctx = crypto._get_ctx(armor=True)
+        with mock.patch.object(ctx, 'sign',
+                               mock.Mock(side_effect=gpg.errors.GPGMEError)):
+            with self.assertRaises(gpg.errors.GPGMEError):
+                crypto.detached_signature_for(
+                    b"text", [crypto.get_key(FPR)])
+        self.assertEqual(ctx.signers, [])
+
+    def test_shares_context_with_encrypt(self):
+        with mock.patch('alot.crypto._get_ctx') as get_ctx:
+            get_ctx.return_value.sign.return_value = (b'', mock.Mock())
+            crypto.detached_signature_for(b"text", [mock.sentinel.KEY])
+            crypto.encrypt(b"text", [mock.sentinel.KEY])
+        self.assertEqual(get_ctx.call_args_list,
+                         [mock.call(armor=True), mock.call(armor=True)])
+
 
 class TestVerifyDetached(unittest.TestCase):
 
@@ -254,6 +295,10 @@ class TestCheckUIDValidity(unittest.TestCase):
 
 class TestListKeys(unittest.TestCase):
 
+    def setUp(self):
+        crypto.list_keys.cache_clear()
+        self.addCleanup(crypto.list_keys.cache_clear)
+
     def test_list_no_hints(self):
         # This only tests that you get 3 keys back (the number in our test
         # keyring), it might be worth adding tests to check more about the keys
@@ -275,9 +320,19 @@ class TestListKeys(unittest.TestCase):
         self.assertEqual(values.uids[0].email, 'amigbu@example.com')
         self.assertTrue(values.secret)
 
+    def test_list_keys_cached(self):
+        crypto.list_keys(hint="ambig")
+        with mock.patch('alot.crypto._get_ctx') as get_ctx:
+            values = crypto.list_keys(hint="ambig")
+        get_ctx.assert_not_called()
+        self.assertEqual(len(values), 2)
+
 
 class TestGetKey(unittest.TestCase):
 
+    def setUp(self):
+        crypto.get_key.cache_clear()
+
     def test_plain(self):
         # Test the uid of the only identity attached to the key we generated.
         with gpg.core.Context() as ctx:
@@ -336,7 +391,7 @@ class TestGetKey(unittest.TestCase):
         invalid_key = utilities.make_key(invalid=True)
         valid_key = utilities.make_key()
 
-        with mock.patch('alot.crypto.gpg.core.Context',
+        with mock.patch('alot.crypto._get_ctx',
                         mock.Mock(return_value=self._context_mock())), \
                 mock.patch('alot.crypto.list_keys',
                            mock.Mock(return_value=[valid_key, invalid_key])):
@@ -344,7 +399,7 @@ class TestGetKey(unittest.TestCase):
         self.assertIs(key, valid_key)
 
     def test_ambiguous_two_valid(self):
-        with mock.patch('alot.crypto.gpg.core.Context',
+        with mock.patch('alot.crypto._get_ctx',
                         mock.Mock(return_value=self._context_mock())), \
                 mock.patch('alot.crypto.list_keys',
                            mock.Mock(return_value=[utilities.make_key(),
@@ -354,7 +409,7 @@ class TestGetKey(unittest.TestCase):
         self.assertEqual(cm.exception.code, GPGCode.AMBIGUOUS_NAME)
 
     def test_ambiguous_no_valid(self):
-        with mock.patch('alot.crypto.gpg.core.Context',
+        with mock.patch('alot.crypto._get_ctx',
                         mock.Mock(return_value=self._context_mock())), \
                 mock.patch('alot.crypto.list_keys',
                            mock.Mock(return_value=[
@@ -364,6 +419,79 @@ class TestGetKey(unittest.TestCase):
                 crypto.get_key('placeholder')
         self.assertEqual(cm.exception.code, GPGCode.NOT_FOUND)
 
+    def test_cached(self):
+        with mock.patch('alot.crypto._get_key',
+                        mock.Mock(return_value=mock.sentinel.KEY)) as m:
+            crypto.get_key('placeholder')
+            key = crypto.get_key('placeholder')
+        self.assertIs(key, mock.sentinel.KEY)
+        m.assert_called_once()
+
+    def test_cache_clear(self):
+        with mock.patch('alot.crypto._get_key',
+                        mock.Mock(return_value=mock.sentinel.KEY)) as m:
+            crypto.get_key('placeholder')
+            crypto.get_key.cache_clear()
+            crypto.get_key('placeholder')
+        self.assertEqual(m.call_count, 2)
+
+    def test_cache_expires(self):
+        with mock.patch('alot.crypto._get_key',
+                        mock.Mock(return_value=mock.sentinel.KEY)) as m, \
+                mock.patch('alot.crypto.time.monotonic',
+                           mock.Mock(side_effect=[0, 100, 100])):
+            crypto.get_key('placeholder')
+            crypto.get_key('placeholder')
+        self.assertEqual(m.call_count, 2)
+
+    def test_errors_not_cached(self):
+        with self.assertRaises(GPGProblem):
+            crypto.get_key('foo@example.com')
+        self.assertNotIn(('foo@example.com', False, False, False, False),
+                         crypto._KEY_CACHE)
+
+
+class TestPrimeKeyCache(unittest.TestCase):
+
+    def setUp(self):
+        crypto.get_key.cache_clear()
+        self.addCleanup(crypto.get_key.cache_clear)
+
+    def test_fingerprints_are_primed(self):
+        crypto.prime_key_cache([FPR])
+        with mock.patch('alot.crypto._get_key') as m:
+            key = crypto.get_key(FPR)
+        m.assert_not_called()
+        self.assertEqual(key.fpr, FPR)
+
+    def test_subkeys_are_primed(self):
+        crypto.prime_key_cache([FPR])
+        with gpg.core.Context() as ctx:
+            subkeys = ctx.get_key(FPR).subkeys
+        for subkey in subkeys:
+            self.assertIn((subkey.fpr, False, False, False, False),
+                          crypto._KEY_CACHE)
+
+    def test_validating_lookups_are_not_primed(self):
+        crypto.prime_key_cache([FPR])
+        self.assertNotIn((FPR, True, False, False, False), crypto._KEY_CACHE)
+
+    def test_priming_is_bounded(self):
+        keys = {fpr: mock.Mock(subkeys=[mock.Mock(), mock.Mock()])
+                for fpr in ('a', 'b', 'c')}
+        with mock.patch('alot.crypto._KEY_CACHE_MAX', 3), \
+                mock.patch('alot.crypto._get_key',
+                           mock.Mock(side_effect=lambda fpr, **_: keys[fpr])):
+            crypto.prime_key_cache(['a', 'b', 'c'])
+        self.assertNotIn((keys['c'].subkeys[0].fpr, False, False, False,
+                          False), crypto._KEY_CACHE)
+
+    def test_unknown_keys_are_ignored(self):
+        crypto.prime_key_cache(['foo@example.com', FPR])
+        self.assertIn((FPR, False, False, False, False), crypto._KEY_CACHE)
+        self.assertNotIn(('foo@example.com', False, False, False, False),
+                         crypto._KEY_CACHE)
+
 
 class TestEncrypt(unittest.TestCase):
 
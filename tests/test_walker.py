@@ -0,0 +1,117 @@
+# This file is released under the GNU GPL, version 3 or a later revision.
+# For further details see the COPYING file
+
+"""Tests for the alot.walker module."""
+
+import unittest
+from unittest import mock
+
+from alot import walker
+from alot.db.errors import NonexistantObjectError
+
+
+class TestIterableWalker(unittest.TestCase):
+
+    @staticmethod
+    def _make_walker(items, **kwargs):
+        factory = mock.Mock(side_effect=lambda obj: mock.Mock(obj=obj))
+        return walker.IterableWalker(iter(items), factory, **kwargs), factory
+
+    def test_reads_iterable_lazily(self):
+        w, factory = self._make_walker(range(100))
+        widget, pos = w.get_focus()
+        self.assertEqual(pos, 0)
+        self.assertEqual(widget.obj, 0)
+        self.assertEqual(w.get_items(), [0])
+        self.assertEqual(factory.call_count, 1)
+
+    def test_walk_to_end(self):
+        w, _ = self._make_walker(range(3))
+        w.get_focus()
+        w.get_next(0)
+        self.assertEqual(w.get_next(1)[0].obj, 2)
+        self.assertEqual(w.get_next(2), (None, None))
+        self.assertTrue(w.empty)
+
+    def test_widgets_are_cached(self):
+        w, factory = self._make_walker(range(3))
+        first = w.get_focus()[0]
+        w.get_next(0)
+        self.assertIs(w.get_focus()[0], first)
+        self.assertEqual(factory.call_count, 2)
+
+    def test_cache_is_bounded(self):
+        w, factory = self._make_walker(range(10), cache=2)
+        for pos in range(10):
+            w.get_next(pos - 1)
+        self.assertEqual(len(w.widgets), 2)
+        self.assertEqual(w.get_prev(1)[0].obj, 0)
+        self.assertEqual(factory.call_count, 11)
+
+    def test_reverse(self):
+        w, _ = self._make_walker(range(3), reverse=True)
+        w.get_focus()
+        self.assertEqual(w.get_prev(0)[0].obj, 1)
+        self.assertEqual(w.get_next(0), (None, None))
+
+    def test_remove(self):
+        w, _ = self._make_walker(range(3))
+        w.get_focus()
+        w.get_next(0)
+        w.get_next(1)
+        self.assertIn(1, w)
+        w.remove(1)
+        self.assertNotIn(1, w)
+        self.assertEqual(w.get_items(), [0, 2])
+        self.assertEqual(w.get_next(0)[0].obj, 2)
+
+    def test_remove_evicted(self):
+        w, _ = self._make_walker(range(3), cache=1)
+        w.get_focus()
+        w.get_next(0)
+        w.get_next(1)
+        self.assertIn(0, w)
+        w.remove(0)
+        self.assertEqual(w.get_items(), [1, 2])
+        self.assertEqual(w.get_focus()[0].obj, 1)
+
+    def test_vanished_evicted(self):
+        deleted = set()
+
+        def factory(obj):
+            if obj in deleted:
+                raise NonexistantObjectError
+            return mock.Mock(obj=obj)
+
+        w = walker.IterableWalker(iter(range(4)), factory, cache=1)
+        w.get_focus()
+        w.get_next(0)
+        w.get_next(1)
+        w.set_focus(2)
+        deleted.add(1)
+        self.assertEqual(w.get_prev(2)[0].obj, 0)
+        self.assertEqual(w.get_items(), [0, 2])
+        self.assertEqual(w.focus, 1)
+        self.assertEqual(w.get_focus()[0].obj, 2)
+        deleted.add(3)
+        self.assertEqual(w.get_next(1), (None, None))
+        self.assertEqual(w.get_items(), [0, 2])
+
+    def test_vanished_focus(self):
+        deleted = set()
+
+        def factory(obj):
+            if obj in deleted:
+                raise NonexistantObjectError
+            return mock.Mock(obj=obj)
+
+        w = walker.IterableWalker(iter(range(2)), factory, cache=1)
+        w.get_focus()
+        w.get_next(0)
+        w.get_next(1)
+        w.get_prev(1)
+        deleted.add(1)
+        w.set_focus(1)
+        widget, pos = w.get_focus()
+        self.assertEqual((widget.obj, pos), (0, 0))
+        self.assertEqual(w.get_items(), [0])